@@ -20,6 +20,7 @@ dependencies = [
     "keyrings.cryptfile==1.3.4",  # Secure storage for keys on Linux (Will be replaced)
     "PyYAML==5.3.1",  # Used for config file format
     "sortedcontainers==2.2.2",  # For maintaining sorted mempools
+    "uvloop==0.14.0; sys_platform != 'win32'",  # Faster asyncio event loop
     "websockets==8.1.0",  # For use in wallet RPC and electron UI
 ]
 
@@ -46,7 +47,7 @@ kwargs = dict(
     install_requires=dependencies,
     setup_requires=["setuptools_scm"],
     extras_require=dict(
-        uvloop=["uvloop"], dev=dev_dependencies, upnp=upnp_dependencies,
+        dev=dev_dependencies, upnp=upnp_dependencies,
     ),
     packages=[
         "build_scripts",
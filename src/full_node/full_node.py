@@ -96,6 +96,8 @@ class FullNode:
             self.log = logging.getLogger(__name__)
 
         self.global_connections = None
+        # Keeps references to the tasks connecting to new peers, so they don't get GCd
+        self._connect_tasks: List[asyncio.Task] = []
 
         self.db_path = path_from_root(root_path, config["database_path"])
         mkdir(self.db_path.parent)
@@ -289,13 +291,16 @@ class FullNode:
 
     def _num_needed_peers(self) -> int:
         assert self.global_connections is not None
-        diff = self.config["target_peer_count"] - len(
-            self.global_connections.get_full_node_connections()
+        diff = (
+            self.config["target_peer_count"]
+            - self.global_connections.count_full_node_connections()
         )
-        return diff if diff >= 0 else 0
+        return max(diff, 0)
 
     def _close(self):
         self._shut_down = True
+        for task in self._connect_tasks:
+            task.cancel()
         self.blockchain.shut_down()
 
     async def _await_closed(self):
@@ -1745,19 +1750,22 @@ class FullNode:
         for peer in request.peer_list:
             conns.peers.add(peer)
 
-        # Pseudo-message to close the connection
-        yield OutboundMessage(NodeType.INTRODUCER, Message("", None), Delivery.CLOSE)
-
-        unconnected = conns.get_unconnected_peers(
-            recent_threshold=self.config["recent_peer_threshold"]
+        num_needed = self._num_needed_peers()
+        if not num_needed:
+            return
+        to_connect = conns.get_unconnected_peers(
+            num_needed, recent_threshold=self.config["recent_peer_threshold"]
         )
-        to_connect = unconnected[: self._num_needed_peers()]
         if not len(to_connect):
             return
 
         self.log.info(f"Trying to connect to peers: {to_connect}")
-        for peer in to_connect:
-            asyncio.create_task(self.server.start_client(peer, self._on_connect))
+        self._connect_tasks = [t for t in self._connect_tasks if not t.done()]
+        self._connect_tasks.append(
+            asyncio.create_task(self.server.start_clients(to_connect, self._on_connect))
+        )
+        for _ in []:  # Yields nothing
+            yield _
 
     @api_request
     async def request_mempool_transactions(
@@ -1,22 +1,50 @@
+import io
 import logging
 import random
 import time
 import asyncio
-from typing import Any, AsyncGenerator, Callable, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional, Set
 
 from src.server.outbound_message import Message, NodeType, OutboundMessage
 from src.types.peer_info import PeerInfo
-from src.types.sized_bytes import bytes32
 from src.util import cbor
 from src.util.ints import uint16, uint64
 
 # Each message is prepended with LENGTH_BYTES bytes specifying the length
 LENGTH_BYTES: int = 4
+# Messages which can be megabytes in size. These are encoded in a worker thread, so that
+# encoding them does not block the event loop. Other messages are encoded inline.
+LARGE_MESSAGE_FUNCTIONS = {
+    "respond_block",
+    "respond_unfinished_block",
+    "all_header_hashes",
+    "respond_all_proof_hashes",
+    "respond_all_header_hashes_after",
+    "respond_generator",
+}
+encoding_executor = ThreadPoolExecutor(max_workers=2)
 log = logging.getLogger(__name__)
 
 OnConnectFunc = Optional[Callable[[], AsyncGenerator[OutboundMessage, None]]]
 
 
+def encode_message(message: Message) -> bytes:
+    """
+    Returns the length prefixed CBOR encoding of the message. The CBOR is written into the same
+    buffer as the prefix, which is filled in afterwards, so that large payloads are not copied
+    again just to prepend their length.
+    """
+    f = io.BytesIO()
+    f.write(bytes(LENGTH_BYTES))
+    cbor.dump({"f": message.function, "d": message.data}, f)
+    length = f.tell() - LENGTH_BYTES
+    assert length < (2 ** (LENGTH_BYTES * 8))
+    f.getbuffer()[:LENGTH_BYTES] = length.to_bytes(LENGTH_BYTES, "big")
+    return f.getvalue()
+
+
 class ChiaConnection:
     """
     Represents a connection to another node. Local host and port are ours, while peer host and
@@ -41,19 +69,24 @@ class ChiaConnection:
         socket = self.writer.get_extra_info("socket")
         self.local_host = socket.getsockname()[0]
         self.local_port = server_port
-        self.peer_host = self.writer.get_extra_info("peername")[0]
-        self.peer_port = self.writer.get_extra_info("peername")[1]
+        peername = self.writer.get_extra_info("peername")
+        self.peer_host = peername[0]
+        self.peer_port = peername[1]
         self.peer_server_port: Optional[int] = None
+        self._cached_peer_info: Optional[PeerInfo] = None
         self.node_id = None
         self.on_connect = on_connect
         self.log = log
+        # Held while a message is encoded and written, so that messages go out in the
+        # order that send was called, even while a large one is encoded in the executor
+        self._send_lock = asyncio.Lock()
 
         # ChiaConnection metrics
         self.creation_time = time.time()
         self.bytes_read = 0
         self.bytes_written = 0
         self.last_message_time: float = 0
-        self._cached_peer_name = self.writer.get_extra_info("peername")
+        self._cached_peer_name = peername
 
     def get_peername(self):
         return self._cached_peer_name
@@ -64,7 +97,16 @@ class ChiaConnection:
     def get_peer_info(self) -> Optional[PeerInfo]:
         if not self.peer_server_port:
             return None
-        return PeerInfo(self.peer_host, uint16(self.peer_server_port))
+        # Called for every connection whenever peers are counted or listed, so the PeerInfo
+        # is only built again if the server port changes
+        if (
+            self._cached_peer_info is None
+            or self._cached_peer_info.port != self.peer_server_port
+        ):
+            self._cached_peer_info = PeerInfo(
+                self.peer_host, uint16(self.peer_server_port)
+            )
+        return self._cached_peer_info
 
     def get_last_message_time(self) -> float:
         return self.last_message_time
@@ -73,15 +115,39 @@ class ChiaConnection:
         return self.writer.is_closing()
 
     async def send(self, message: Message):
-        encoded: bytes = cbor.dumps({"f": message.function, "d": message.data})
-        assert len(encoded) < (2 ** (LENGTH_BYTES * 8))
-        self.writer.write(len(encoded).to_bytes(LENGTH_BYTES, "big") + encoded)
+        async with self._send_lock:
+            if message.encoded is None:
+                if message.function in LARGE_MESSAGE_FUNCTIONS:
+                    if message.encoding is None:
+                        message.encoding = asyncio.get_running_loop().run_in_executor(
+                            encoding_executor, encode_message, message
+                        )
+                    encoding = message.encoding
+                    try:
+                        # Every connection sending this message awaits the same
+                        # future, so cancelling one send must not cancel the encoding
+                        message.encoded = await asyncio.shield(encoding)
+                    finally:
+                        if message.encoded is None and encoding.done():
+                            # Failed encodings are not kept, so later sends encode again
+                            message.encoding = None
+                else:
+                    message.encoded = encode_message(message)
+            encoded: bytes = message.encoded
+            self.writer.write(encoded)
         try:
             # Need timeout here in case connection is closed, this allows GC to clean up
             await asyncio.wait_for(self.writer.drain(), timeout=10 * 60)
         except asyncio.TimeoutError:
             raise TimeoutError("self.writer.drain()")
-        self.bytes_written += LENGTH_BYTES + len(encoded)
+        self.bytes_written += len(encoded)
+
+    async def wait_for_pending_sends(self):
+        """
+        Waits until all messages that were already passed to send have been written.
+        """
+        async with self._send_lock:
+            pass
 
     async def read_one_message(self) -> Message:
         size: bytes = b""
@@ -112,6 +178,7 @@ class ChiaConnection:
     def close(self):
         # Closes the connection. This should only be called by PeerConnections class.
         self.writer.close()
+        self._cached_peer_info = None
 
     def __str__(self) -> str:
         if self.peer_server_port is not None:
@@ -119,15 +186,27 @@ class ChiaConnection:
         return f"Connection({self.get_peername()})"
 
 
+def is_full_node_connection(connection: ChiaConnection) -> bool:
+    """
+    Whether the connection is to a full node peer. This is what peer slots are counted
+    and freed by. Introducer, farmer and timelord connections also have a peer info
+    after the handshake, so the connection type is checked instead.
+    """
+    return connection.connection_type == NodeType.FULL_NODE
+
+
 class PeerConnections:
     def __init__(self, all_connections: List[ChiaConnection] = []):
         self._all_connections = all_connections
         # Only full node peers are added to `peers`
         self.peers = Peers()
         for c in all_connections:
-            if c.connection_type == NodeType.FULL_NODE:
+            if is_full_node_connection(c):
                 self.peers.add(c.get_peer_info())
         self.state_changed_callback: Optional[Callable] = None
+        # Set when a full node connection is closed, to wake up tasks waiting for a free
+        # peer slot. Created lazily, so that it belongs to the running event loop.
+        self._peer_slot_available: Optional[asyncio.Event] = None
 
     def set_state_changed_callback(self, callback: Callable):
         self.state_changed_callback = callback
@@ -142,7 +221,7 @@ class PeerConnections:
                 return False
         self._all_connections.append(connection)
 
-        if connection.connection_type == NodeType.FULL_NODE:
+        if is_full_node_connection(connection):
             self._state_changed("add_connection")
             return self.peers.add(connection.get_peer_info())
         self._state_changed("add_connection")
@@ -156,32 +235,58 @@ class PeerConnections:
             self._state_changed("close_connection")
             if not keep_peer:
                 self.peers.remove(info)
+            if is_full_node_connection(connection):
+                self._notify_peer_slot_available()
 
     def close_all_connections(self):
+        closed_full_node = False
         for connection in self._all_connections:
             connection.close()
             self._state_changed("close_connection")
+            if is_full_node_connection(connection):
+                closed_full_node = True
         self._all_connections = []
         self.peers = Peers()
+        if closed_full_node:
+            self._notify_peer_slot_available()
+
+    def _notify_peer_slot_available(self):
+        if self._peer_slot_available is not None:
+            self._peer_slot_available.set()
+            # Tasks that start waiting after this wait for the next close
+            self._peer_slot_available = None
+
+    async def wait_for_peer_slot(self, timeout: float) -> bool:
+        """
+        Waits until a full node connection is closed, or until timeout seconds have
+        passed. Returns whether a full node connection was closed.
+        """
+        if self._peer_slot_available is None:
+            self._peer_slot_available = asyncio.Event()
+        try:
+            await asyncio.wait_for(self._peer_slot_available.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
 
     def get_connections(self):
         return self._all_connections
 
-    def get_full_node_connections(self):
-        return list(filter(ChiaConnection.get_peer_info, self._all_connections))
+    def get_full_node_connections(self) -> List[ChiaConnection]:
+        return list(filter(is_full_node_connection, self._all_connections))
 
-    def get_full_node_peerinfos(self):
-        return list(
-            filter(None, map(ChiaConnection.get_peer_info, self._all_connections))
-        )
+    def count_full_node_connections(self) -> int:
+        return sum(1 for c in self._all_connections if is_full_node_connection(c))
+
+    def get_full_node_peerinfos(self) -> List[PeerInfo]:
+        peer_infos = map(ChiaConnection.get_peer_info, self.get_full_node_connections())
+        return list(filter(None, peer_infos))
 
     def get_unconnected_peers(self, max_peers=0, recent_threshold=9999999):
-        connected = self.get_full_node_peerinfos()
-        peers = self.peers.get_peers(recent_threshold=recent_threshold)
-        unconnected = list(filter(lambda peer: peer not in connected, peers))
-        if not max_peers:
-            max_peers = len(unconnected)
-        return unconnected[:max_peers]
+        connected = set(self.get_full_node_peerinfos())
+        return self.peers.get_peers(
+            max_peers, recent_threshold=recent_threshold, exclude=connected
+        )
 
 
 class Peers:
@@ -191,34 +296,49 @@ class Peers:
     """
 
     def __init__(self):
-        self._peers: List[PeerInfo] = []
-        self.time_added: Dict[bytes32, uint64] = {}
+        # Used as an insertion ordered set, for constant time membership checks
+        self._peers: Dict[PeerInfo, None] = {}
+        self.time_added: Dict[PeerInfo, uint64] = {}
 
     def add(self, peer: Optional[PeerInfo]) -> bool:
         if peer is None or not peer.port:
             return False
-        if peer not in self._peers:
-            self._peers.append(peer)
-        self.time_added[peer.get_hash()] = uint64(int(time.time()))
+        self._peers[peer] = None
+        self.time_added[peer] = uint64(int(time.time()))
         return True
 
     def remove(self, peer: Optional[PeerInfo]) -> bool:
         if peer is None or not peer.port:
             return False
         try:
-            self._peers.remove(peer)
+            del self._peers[peer]
             return True
-        except ValueError:
+        except KeyError:
             return False
 
     def get_peers(
-        self, max_peers: int = 0, randomize: bool = False, recent_threshold=9999999
+        self,
+        max_peers: int = 0,
+        randomize: bool = False,
+        recent_threshold=9999999,
+        exclude: Optional[Set[PeerInfo]] = None,
     ) -> List[PeerInfo]:
-        target_peers = [
+        """
+        Returns up to max_peers (or all, if 0) peers that were added within recent_threshold
+        seconds and are not in exclude. Unless randomizing, stops scanning once enough peers
+        have been found.
+        """
+        # Only peers added after this time are recent enough to be returned
+        min_time_added = time.time() - recent_threshold
+        target_peers_iter = (
             peer
             for peer in self._peers
-            if time.time() - self.time_added[peer.get_hash()] < recent_threshold
-        ]
+            if self.time_added[peer] > min_time_added
+            and (exclude is None or peer not in exclude)
+        )
+        if max_peers and not randomize:
+            return list(islice(target_peers_iter, max_peers))
+        target_peers = list(target_peers_iter)
         if not max_peers or max_peers > len(target_peers):
             max_peers = len(target_peers)
         if randomize:
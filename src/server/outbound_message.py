@@ -1,4 +1,5 @@
-from dataclasses import dataclass
+import asyncio
+from dataclasses import dataclass, field
 from enum import IntEnum
 from typing import Any, Optional
 from src.types.sized_bytes import bytes32
@@ -34,6 +35,15 @@ class Message:
     function: str
     # Message data for that function call
     data: Any
+    # Length prefixed CBOR encoding of this message, set the first time it is sent, so that
+    # a message sent to many peers is only encoded once
+    encoded: Optional[bytes] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # Pending encoding of a large message in a worker thread, shared by all the sends of it
+    encoding: Optional["asyncio.Future[bytes]"] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
 
 @dataclass
@@ -3,7 +3,7 @@ import concurrent
 import logging
 import random
 import ssl
-from typing import Any, AsyncGenerator, List, Optional, Tuple
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional, Tuple
 
 from aiter import aiter_forker, iter_to_aiter, join_aiters, map_aiter, push_aiter
 
@@ -80,10 +80,15 @@ async def initialize_pipeline(
         map_aiter(connection_to_message, handshake_finished_1, 100)
     )
 
+    # API functions that have already been looked up, by message function name
+    api_handlers: Dict[str, Tuple[Callable, bool]] = {}
+
     # Handles each message one at a time, and yields responses to send back or broadcast
     responses_aiter = join_aiters(
         map_aiter(
-            partial_func.partial_async_gen(handle_message, api), messages_aiter, 100,
+            partial_func.partial_async_gen(handle_message, api, api_handlers),
+            messages_aiter,
+            100,
         )
     )
 
@@ -119,6 +124,11 @@ async def initialize_pipeline(
             )
             global_connections.close(connection, True)
 
+    async def close(connection: ChiaConnection):
+        # Messages queued for this connection before the close are written first
+        await connection.wait_for_pending_sends()
+        global_connections.close(connection, True)
+
     # This will run forever. Sends each message through the TCP connection, using the
     # length encoding and CBOR serialization
     async for connection, message in expanded_messages_aiter:
@@ -126,7 +136,7 @@ async def initialize_pipeline(
             continue
         if message is None:
             # Does not ban the peer, this is just a graceful close of connection.
-            global_connections.close(connection, True)
+            asyncio.create_task(close(connection))
             continue
         if connection.is_closing():
             connection.log.info(
@@ -289,12 +299,29 @@ async def connection_to_message(
         global_connections.close(connection, True)
 
 
+def lookup_api_handler(api: Any, function: str) -> Optional[Tuple[Callable, bool]]:
+    """
+    Finds the api function that handles messages for function, and whether it also takes
+    the peer name.
+    """
+    f_with_peer_name = getattr(api, function + "_with_peer_name", None)
+    if f_with_peer_name is not None:
+        return f_with_peer_name, True
+    f = getattr(api, function, None)
+    if f is not None:
+        return f, False
+    return None
+
+
 async def handle_message(
-    triple: Tuple[ChiaConnection, Message, PeerConnections], api: Any
+    triple: Tuple[ChiaConnection, Message, PeerConnections],
+    api: Any,
+    api_handlers: Dict[str, Tuple[Callable, bool]],
 ) -> AsyncGenerator[Tuple[ChiaConnection, OutboundMessage, PeerConnections], None]:
     """
     Async generator which takes messages, parses, them, executes the right
     api function, and yields responses (to same connection, propagated, etc).
+    Api functions are looked up once per function name, and stored in api_handlers.
     """
     connection, full_message, global_connections = triple
 
@@ -319,18 +346,20 @@ async def handle_message(
         elif full_message.function == "pong":
             return
 
-        f_with_peer_name = getattr(api, full_message.function + "_with_peer_name", None)
-
-        if f_with_peer_name is not None:
-            result = f_with_peer_name(full_message.data, connection.get_peername())
-        else:
-            f = getattr(api, full_message.function, None)
-
-            if f is None:
+        handler = api_handlers.get(full_message.function)
+        if handler is None:
+            handler = lookup_api_handler(api, full_message.function)
+            if handler is None:
+                # Not cached, so that unknown function names cannot grow api_handlers
                 raise ProtocolError(
                     Err.INVALID_PROTOCOL_MESSAGE, [full_message.function]
                 )
+            api_handlers[full_message.function] = handler
 
+        f, with_peer_name = handler
+        if with_peer_name:
+            result = f(full_message.data, connection.get_peername())
+        else:
             result = f(full_message.data)
 
         if isinstance(result, AsyncGenerator):
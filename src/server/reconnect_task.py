@@ -28,6 +28,8 @@ def start_reconnect_task(server, peer_info_arg, log, auth):
                 log.info(f"Reconnecting to peer {peer_info}")
                 try:
                     await server.start_client(peer_info, None, auth=auth)
+                except asyncio.CancelledError:
+                    raise
                 except Exception as e:
                     log.warning(f"Failed to connect to {peer_info} {e}")
             await asyncio.sleep(3)
@@ -141,8 +141,13 @@ class ChiaServer:
                 )
             )
             self._oc_tasks.append(oc_task)
-            reader, writer = await oc_task
-            self._oc_tasks.remove(oc_task)
+            try:
+                reader, writer = await oc_task
+            finally:
+                # Also removed when the attempt fails or is cancelled by start_clients
+                self._oc_tasks.remove(oc_task)
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
             self.log.warning(
                 f"Could not connect to {target_node}. {type(e)}{str(e)}. Aborting and removing peer."
@@ -158,6 +163,36 @@ class ChiaServer:
 
         return True
 
+    async def start_clients(
+        self,
+        target_nodes: List[PeerInfo],
+        on_connect: OnConnectFunc = None,
+        auth: bool = False,
+        max_concurrent: int = 16,
+        timeout: int = 10,
+    ) -> List[bool]:
+        """
+        Connects to several nodes concurrently, with at most max_concurrent connection attempts
+        in progress at a time. Each attempt is abandoned after timeout seconds. Returns whether
+        each connection was successful.
+        """
+        semaphore = asyncio.Semaphore(max_concurrent)
+
+        async def start_client_bounded(target_node: PeerInfo) -> bool:
+            async with semaphore:
+                try:
+                    return await asyncio.wait_for(
+                        self.start_client(target_node, on_connect, auth), timeout
+                    )
+                except asyncio.TimeoutError:
+                    self.log.warning(
+                        f"Timed out connecting to {target_node}. Removing peer."
+                    )
+                    self.global_connections.peers.remove(target_node)
+                    return False
+
+        return await asyncio.gather(*[start_client_bounded(n) for n in target_nodes])
+
     async def await_closed(self):
         """
         Await until the pipeline is done, after which the server and all clients are closed.
@@ -2,6 +2,7 @@ import asyncio
 import logging
 import logging.config
 import signal
+import time
 
 from sys import platform
 from typing import Any, AsyncGenerator, Callable, List, Optional, Tuple
@@ -23,6 +24,12 @@ from src.server.connection import OnConnectFunc
 
 from .reconnect_task import start_reconnect_task
 
+# Disconnects wake the introducer poll early, but it does not poll more often than this
+MIN_INTRODUCER_POLL_INTERVAL = 10
+# Seconds an introducer connection is kept open after a poll, so that a poll woken by a
+# disconnect can reuse it
+INTRODUCER_KEEPALIVE = 30
+
 OutboundMessageGenerator = AsyncGenerator[OutboundMessage, None]
 
 
@@ -48,25 +55,55 @@ def create_periodic_introducer_poll_task(
     """
 
     def _num_needed_peers() -> int:
-        diff = target_peer_count - len(global_connections.get_full_node_connections())
-        return diff if diff >= 0 else 0
+        diff = target_peer_count - global_connections.count_full_node_connections()
+        return max(diff, 0)
 
     async def introducer_client():
         async def on_connect() -> OutboundMessageGenerator:
             msg = Message("request_peers", introducer_protocol.RequestPeers())
             yield OutboundMessage(NodeType.INTRODUCER, msg, Delivery.RESPOND)
 
+        def get_introducer_connections():
+            return [
+                connection
+                for connection in global_connections.get_connections()
+                if connection.connection_type == NodeType.INTRODUCER
+            ]
+
+        def close_introducer_connections():
+            for connection in get_introducer_connections():
+                global_connections.close(connection)
+
         while True:
-            # If we are still connected to introducer, disconnect
-            for connection in global_connections.get_connections():
-                if connection.connection_type == NodeType.INTRODUCER:
-                    global_connections.close(connection)
-            # The first time connecting to introducer, keep trying to connect
+            poll_time = time.time()
             if _num_needed_peers():
-                if not await server.start_client(peer_info, on_connect):
+                if len(get_introducer_connections()) > 0:
+                    # Still connected to the introducer, so reuse the connection instead
+                    # of reconnecting and performing the handshake again
+                    msg = Message("request_peers", introducer_protocol.RequestPeers())
+                    server.push_message(
+                        OutboundMessage(NodeType.INTRODUCER, msg, Delivery.BROADCAST)
+                    )
+                # The first time connecting to introducer, keep trying to connect
+                elif not await server.start_client(peer_info, on_connect):
                     await asyncio.sleep(5)
                     continue
-            await asyncio.sleep(introducer_connect_interval)
+            else:
+                # We have enough peers, so the introducer connection is no longer needed
+                close_introducer_connections()
+            # Poll again after the interval, or earlier if a full node peer disconnects.
+            # The introducer connection is closed once it has been idle for
+            # INTRODUCER_KEEPALIVE seconds, so that connections don't pile up there.
+            keepalive = min(INTRODUCER_KEEPALIVE, introducer_connect_interval)
+            if not await global_connections.wait_for_peer_slot(keepalive):
+                close_introducer_connections()
+                await global_connections.wait_for_peer_slot(
+                    max(0, introducer_connect_interval - (time.time() - poll_time))
+                )
+            min_interval = min(
+                MIN_INTRODUCER_POLL_INTERVAL, introducer_connect_interval
+            )
+            await asyncio.sleep(max(0, min_interval - (time.time() - poll_time)))
 
     return asyncio.create_task(introducer_client())
 
@@ -122,10 +159,9 @@ class Service:
             config,
             name=f"{service_name}_server",
         )
-        for _ in ["set_server", "_set_server"]:
-            f = getattr(api, _, None)
-            if f:
-                f(self._server)
+        f = getattr(api, "set_server", None) or getattr(api, "_set_server", None)
+        if f:
+            f(self._server)
 
         self._connect_peers = connect_peers
         self._auth_connect_peers = auth_connect_peers
@@ -143,6 +179,10 @@ class Service:
         self._await_closed_callback = await_closed_callback
         self._advertised_port = advertised_port
         self._server_sockets: List = []
+        # Introducer poll and reconnect tasks, cancelled when the service stops
+        self._background_tasks: List[asyncio.Task] = []
+        self._rpc_task: Optional[asyncio.Task] = None
+        self._rpc_close_task: Optional[asyncio.Task] = None
 
     def start(self):
         if self._task is not None:
@@ -151,24 +191,26 @@ class Service:
         async def _run():
             if self._start_callback:
                 await self._start_callback()
+            if self._is_stopping:
+                # stop() ran during the start callback, before any task was created
+                return
 
-            self._introducer_poll_task = None
             if self._periodic_introducer_poll:
                 (
                     peer_info,
                     introducer_connect_interval,
                     target_peer_count,
                 ) = self._periodic_introducer_poll
-                self._introducer_poll_task = create_periodic_introducer_poll_task(
-                    self._server,
-                    peer_info,
-                    self._server.global_connections,
-                    introducer_connect_interval,
-                    target_peer_count,
+                self._background_tasks.append(
+                    create_periodic_introducer_poll_task(
+                        self._server,
+                        peer_info,
+                        self._server.global_connections,
+                        introducer_connect_interval,
+                        target_peer_count,
+                    )
                 )
 
-            self._rpc_task = None
-            self._rpc_close_task = None
             if self._rpc_info:
                 rpc_api, rpc_port = self._rpc_info
 
@@ -182,16 +224,20 @@ class Service:
                     )
                 )
 
-            self._reconnect_tasks = [
+            self._background_tasks.extend(
                 start_reconnect_task(
                     self._server, _, self._log, self._auth_connect_peers
                 )
                 for _ in self._connect_peers
-            ]
+            )
             self._server_sockets = [
                 await start_server(self._server, self._on_connect_callback)
                 for _ in self._server_listen_ports
             ]
+            if self._is_stopping:
+                # stop() ran while the sockets were being opened, so it missed them
+                for server_socket in self._server_sockets:
+                    server_socket.close()
 
             signal.signal(signal.SIGINT, global_signal_handler)
             signal.signal(signal.SIGTERM, global_signal_handler)
@@ -215,17 +261,14 @@ class Service:
         if not self._is_stopping:
             self._is_stopping = True
             self._log.info("Closing server sockets")
-            for _ in self._server_sockets:
-                _.close()
-            self._log.info("Cancelling reconnect task")
-            for _ in self._reconnect_tasks:
-                _.cancel()
+            for server_socket in self._server_sockets:
+                server_socket.close()
+            self._log.info("Cancelling introducer and reconnect tasks")
+            for task in self._background_tasks:
+                task.cancel()
             self._log.info("Closing connections")
             self._server.close_all()
             self._api._shut_down = True
-            self._log.info("Stopping introducer task")
-            if self._introducer_poll_task:
-                self._introducer_poll_task.cancel()
 
             self._log.info("Calling service stop callback")
             if self._stop_callback:
@@ -241,8 +284,11 @@ class Service:
 
     async def wait_closed(self):
         self._log.info("Waiting for socket to be closed (if opened)")
-        for _ in self._server_sockets:
-            await _.wait_closed()
+        for server_socket in self._server_sockets:
+            await server_socket.wait_closed()
+
+        self._log.info("Waiting for introducer and reconnect tasks to finish")
+        await asyncio.gather(*self._background_tasks, return_exceptions=True)
 
         self._log.info("Waiting for ChiaServer to be closed")
         await self._server.await_closed()
@@ -262,10 +308,14 @@ class Service:
 
 async def async_run_service(*args, **kwargs):
     service = Service(*args, **kwargs)
+    loop_type = type(asyncio.get_running_loop())
+    service._log.info(f"Using event loop {loop_type.__module__}.{loop_type.__name__}")
     return await service.run()
 
 
 def run_service(*args, **kwargs):
+    # uvloop is a dependency on every platform except Windows. Setting the policy before
+    # asyncio.run makes every loop created in this process a uvloop loop.
     if uvloop is not None:
-        uvloop.install()
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     return asyncio.run(async_run_service(*args, **kwargs))
@@ -1,4 +1,4 @@
-from typing import Any, Dict, get_type_hints
+from typing import Any, BinaryIO
 
 import cbor2
 
@@ -17,8 +17,7 @@ def default_encoder(encoder, value: Any):
     on each property.
     """
     if hasattr(type(value), "__cbor_message__"):
-        fields: Dict = get_type_hints(value)
-        els = {f_name: getattr(value, f_name) for f_name in fields.keys()}
+        els = {f_name: getattr(value, f_name) for f_name in value.__cbor_fields__}
         encoder.encode(els)
     elif hasattr(type(value), "__bytes__"):
         encoder.encode(bytes(value))
@@ -30,5 +29,9 @@ def dumps(data: Any) -> bytes:
     return cbor2.dumps(data, default=default_encoder)
 
 
+def dump(data: Any, fp: BinaryIO) -> None:
+    cbor2.dump(data, fp, default=default_encoder)
+
+
 def loads(data: bytes) -> Any:
     return cbor2.loads(data)
@@ -1,4 +1,4 @@
-from typing import Any, Type
+from typing import Any, Type, get_type_hints
 
 from src.util.type_checking import strictdataclass
 
@@ -6,7 +6,41 @@ from src.util.type_checking import strictdataclass
 def cbor_message(cls: Any) -> Type:
     """
     Decorator, converts a class into a strictdataclass, which checks all arguments to make sure
-    they are the right type.
+    they are the right type. The field names are computed once here and stored in
+    __cbor_fields__, so that encoding does not have to resolve type hints for every message.
+
+    The class is rebuilt with __slots__ for its fields, so messages have no instance __dict__.
     """
-    cls1 = strictdataclass(cls=cls)
-    return type(cls.__name__, (cls1,), {"__cbor_message__": True})
+    cls1 = strictdataclass(cls=_with_slots(cls))
+    fields = tuple(get_type_hints(cls1).keys())
+    return type(
+        cls.__name__,
+        (cls1,),
+        {
+            "__module__": cls.__module__,
+            "__qualname__": cls.__qualname__,
+            "__slots__": (),
+            "__cbor_message__": True,
+            "__cbor_fields__": fields,
+            "__getstate__": _getstate,
+            "__setstate__": _setstate,
+        },
+    )
+
+
+def _with_slots(cls: Any) -> Type:
+    namespace = {
+        k: v for k, v in cls.__dict__.items() if k not in ("__dict__", "__weakref__")
+    }
+    namespace["__slots__"] = tuple(cls.__dict__.get("__annotations__", {}).keys())
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+
+def _getstate(self: Any) -> Any:
+    # Frozen classes with __slots__ cannot be copied or unpickled through the default setattr
+    return [getattr(self, f_name) for f_name in self.__cbor_fields__]
+
+
+def _setstate(self: Any, state: Any) -> None:
+    for f_name, value in zip(self.__cbor_fields__, state):
+        object.__setattr__(self, f_name, value)
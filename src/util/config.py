@@ -1,4 +1,6 @@
 import argparse
+import copy
+import functools
 import pkg_resources
 import sys
 import yaml
@@ -35,6 +37,18 @@ def save_config(root_path: Path, filename: Union[str, Path], config_data: Any):
     with open(path.with_suffix("." + str(os.getpid())), "w") as f:
         yaml.safe_dump(config_data, f)
     shutil.move(str(path.with_suffix("." + str(os.getpid()))), path)
+    _load_config_file.cache_clear()
+
+
+@functools.lru_cache(maxsize=8)
+def _load_config_file(path: Path, mtime_ns: int) -> Any:
+    """
+    Parses a config file, caching the result so that a process loading the same config several
+    times only parses it once. The modification time is part of the key, so that changes to
+    the file are picked up. The returned object is shared, so it must not be modified.
+    """
+    with open(path, "r") as f:
+        return yaml.safe_load(f)
 
 
 def load_config(
@@ -51,10 +65,11 @@ def load_config(
         print("** please run `chia init` to migrate or create new config files **")
         # TODO: fix this hack
         sys.exit(-1)
-    r = yaml.safe_load(open(path, "r"))
+    r = _load_config_file(path.resolve(), path.stat().st_mtime_ns)
     if sub_config is not None:
         r = r.get(sub_config)
-    return r
+    # Callers are free to modify the config they get back
+    return copy.deepcopy(r)
 
 
 def load_config_cli(
@@ -5,7 +5,7 @@ import dataclasses
 import io
 import pprint
 from enum import Enum
-from typing import Any, BinaryIO, List, Type, get_type_hints, Dict
+from typing import Any, BinaryIO, List, Type, Dict
 from src.util.byte_types import hexstr_to_bytes
 from src.types.program import Program
 from src.util.hash import std_hash
@@ -15,6 +15,7 @@ from blspy import PrivateKey, G1Element, G2Element
 from src.types.sized_bytes import bytes32
 from src.util.ints import uint32, uint64, int64, uint128, int512
 from src.util.type_checking import (
+    get_class_type_hints,
     is_type_List,
     is_type_Tuple,
     is_type_SpecificOptional,
@@ -140,7 +141,7 @@ class Streamable:
     @classmethod
     def parse(cls: Type[cls.__name__], f: BinaryIO) -> cls.__name__:  # type: ignore
         values = []
-        for _, f_type in get_type_hints(cls).items():
+        for _, f_type in get_class_type_hints(cls).items():
             values.append(cls.parse_one_item(f_type, f))  # type: ignore
         return cls(*values)
 
@@ -181,7 +182,7 @@ class Streamable:
             raise NotImplementedError(f"can't stream {item}, {f_type}")
 
     def stream(self, f: BinaryIO) -> None:
-        for f_name, f_type in get_type_hints(self).items():  # type: ignore
+        for f_name, f_type in get_class_type_hints(type(self)).items():
             self.stream_one_item(f_type, getattr(self, f_name), f)
 
     def get_hash(self) -> bytes32:
@@ -1,5 +1,6 @@
 import dataclasses
-from typing import Any, List, Type, Union, get_type_hints
+import functools
+from typing import Any, Dict, List, Type, Union, get_type_hints
 
 
 def is_type_List(f_type: Type) -> bool:
@@ -25,6 +26,15 @@ def is_type_Tuple(f_type: Type) -> bool:
     ) or f_type == tuple
 
 
+@functools.lru_cache(maxsize=None)
+def get_class_type_hints(cls: Type) -> Dict[str, Type]:
+    """
+    Returns the type hints of a class, resolving them only the first time they are needed for
+    that class. The returned dictionary is shared, so it must not be modified.
+    """
+    return get_type_hints(cls)
+
+
 def strictdataclass(cls: Any):
     class _Local:
         """
@@ -34,6 +44,9 @@ def strictdataclass(cls: Any):
         bytes can be passed in and the type can be constructed.
         """
 
+        # Adds no instance __dict__, so that classes with __slots__ keep them
+        __slots__ = ()
+
         def parse_item(self, item: Any, f_name: str, f_type: Type) -> Any:
             if is_type_List(f_type):
                 collected_list: List = []
@@ -63,7 +76,16 @@ def strictdataclass(cls: Any):
                         self.parse_item(tuple_item, f_name, inner_type)
                     )
                 return tuple(collected_list)
-            if not isinstance(item, f_type):
+            if (
+                isinstance(item, bytes)
+                and dataclasses.is_dataclass(f_type)
+                and hasattr(f_type, "from_bytes")
+            ):
+                # Streamable objects are sent over the wire as their serialization. Parsing
+                # them directly avoids a failed constructor call for each one, which matters
+                # for long lists such as the peer list of RespondPeers.
+                item = f_type.from_bytes(item)
+            elif not isinstance(item, f_type):
                 try:
                     item = f_type(item)
                 except (TypeError, AttributeError, ValueError):
@@ -76,19 +98,19 @@ def strictdataclass(cls: Any):
             return item
 
         def __post_init__(self):
-            fields = get_type_hints(self)
-            data = self.__dict__
+            fields = get_class_type_hints(type(self))
             for (f_name, f_type) in fields.items():
-                if f_name not in data:
+                try:
+                    item = getattr(self, f_name)
+                except AttributeError:
                     raise ValueError(f"Field {f_name} not present")
-                object.__setattr__(
-                    self, f_name, self.parse_item(data[f_name], f_name, f_type)
-                )
+                object.__setattr__(self, f_name, self.parse_item(item, f_name, f_type))
 
     class NoTypeChecking:
+        __slots__ = ()
         __no_type_check__ = True
 
     cls1 = dataclasses.dataclass(cls, init=False, frozen=True)  # type: ignore
     if dataclasses.fields(cls1) == ():
-        return type(cls.__name__, (cls1, _Local, NoTypeChecking), {})
-    return type(cls.__name__, (cls1, _Local), {})
+        return type(cls.__name__, (cls1, _Local, NoTypeChecking), {"__slots__": ()})
+    return type(cls.__name__, (cls1, _Local), {"__slots__": ()})
@@ -289,8 +289,9 @@ class WalletNode:
         if self.wallet_state_manager is None or self.backup_initialized is False:
             return 0
         assert self.server is not None
-        diff = self.config["target_peer_count"] - len(
-            self.global_connections.get_full_node_connections()
+        diff = (
+            self.config["target_peer_count"]
+            - self.global_connections.count_full_node_connections()
         )
         if diff < 0:
             return 0
@@ -300,10 +301,8 @@ class WalletNode:
                 self.config["full_node_peer"]["host"],
                 self.config["full_node_peer"]["port"],
             )
-            peers = [
-                c.get_peer_info()
-                for c in self.global_connections.get_full_node_connections()
-            ]
+            full_node_connections = self.global_connections.get_full_node_connections()
+            peers = [c.get_peer_info() for c in full_node_connections]
             full_node_resolved = PeerInfo(
                 socket.gethostbyname(full_node_peer.host), full_node_peer.port
             )
@@ -311,14 +310,9 @@ class WalletNode:
                 self.log.info(
                     f"Will not attempt to connect to other nodes, already connected to {full_node_peer}"
                 )
-                for connection in self.global_connections.get_full_node_connections():
-                    if (
-                        connection.get_peer_info() != full_node_peer
-                        and connection.get_peer_info() != full_node_resolved
-                    ):
-                        self.log.info(
-                            f"Closing unnecessary connection to {connection.get_peer_info()}."
-                        )
+                for connection, peer_info in zip(full_node_connections, peers):
+                    if peer_info != full_node_peer and peer_info != full_node_resolved:
+                        self.log.info(f"Closing unnecessary connection to {peer_info}.")
                         self.global_connections.close(connection)
                 return 0
         return diff
@@ -336,23 +330,19 @@ class WalletNode:
         for peer in request.peer_list:
             conns.peers.add(peer)
 
-        # Pseudo-message to close the connection
-        yield OutboundMessage(NodeType.INTRODUCER, Message("", None), Delivery.CLOSE)
-
-        unconnected = conns.get_unconnected_peers(
-            recent_threshold=self.config["recent_peer_threshold"]
+        num_needed = self._num_needed_peers()
+        if not num_needed:
+            return
+        to_connect = conns.get_unconnected_peers(
+            num_needed, recent_threshold=self.config["recent_peer_threshold"]
         )
-        to_connect = unconnected[: self._num_needed_peers()]
         if not len(to_connect):
             return
 
         self.log.info(f"Trying to connect to peers: {to_connect}")
-        tasks = []
-        for peer in to_connect:
-            tasks.append(
-                asyncio.create_task(self.server.start_client(peer, self._on_connect))
-            )
-        await asyncio.gather(*tasks)
+        await self.server.start_clients(to_connect, self._on_connect)
+        for _ in []:  # Yields nothing
+            yield _
 
     async def _sync(self):
         """
@@ -0,0 +1,260 @@
+import asyncio
+import logging
+import time
+import unittest
+from typing import List
+
+import pytest
+
+from src.server import connection as connection_module
+from src.server.connection import (
+    LENGTH_BYTES,
+    ChiaConnection,
+    PeerConnections,
+    Peers,
+    encode_message,
+)
+from src.server.outbound_message import Message, NodeType
+from src.types.peer_info import PeerInfo
+from src.util import cbor
+from src.util.ints import uint16, uint64
+
+
+class FakeSocket:
+    def getsockname(self):
+        return ("127.0.0.1", 8444)
+
+
+class FakeStreamWriter:
+    def __init__(self, port: int):
+        self.port = port
+        self.closed = False
+        self.written: List[bytes] = []
+
+    def get_extra_info(self, name: str):
+        if name == "socket":
+            return FakeSocket()
+        if name == "peername":
+            return ("127.0.0.1", self.port)
+        return None
+
+    def write(self, data: bytes):
+        self.written.append(data)
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def is_closing(self) -> bool:
+        return self.closed
+
+
+def make_connection(connection_type: NodeType, port: int) -> ChiaConnection:
+    connection = ChiaConnection(
+        NodeType.FULL_NODE,
+        connection_type,
+        None,  # type: ignore
+        FakeStreamWriter(port),  # type: ignore
+        8444,
+        None,
+        logging.getLogger(__name__),
+    )
+    connection.peer_server_port = port
+    connection.node_id = port
+    return connection
+
+
+def written_functions(connection: ChiaConnection) -> List[str]:
+    return [cbor.loads(data[LENGTH_BYTES:])["f"] for data in connection.writer.written]
+
+
+def slow_encode_message(message: Message) -> bytes:
+    if message.function in connection_module.LARGE_MESSAGE_FUNCTIONS:
+        time.sleep(0.2)
+    return encode_message(message)
+
+
+class TestPeers(unittest.TestCase):
+    def setUp(self):
+        self.peers = Peers()
+        self.infos = [PeerInfo("127.0.0.1", uint16(8444 + i)) for i in range(10)]
+        for info in self.infos:
+            assert self.peers.add(info)
+
+    def test_get_peers(self):
+        assert self.peers.get_peers() == self.infos
+        assert self.peers.get_peers(3) == self.infos[:3]
+        assert self.peers.get_peers(20) == self.infos
+
+    def test_get_peers_randomize(self):
+        random_peers = self.peers.get_peers(3, randomize=True)
+        assert len(random_peers) == 3
+        assert len(set(random_peers)) == 3
+        assert set(random_peers) <= set(self.infos)
+        assert sorted(self.peers.get_peers(randomize=True), key=lambda p: p.port) == (
+            self.infos
+        )
+
+    def test_get_peers_exclude(self):
+        exclude = set(self.infos[:2])
+        assert self.peers.get_peers(exclude=exclude) == self.infos[2:]
+        assert self.peers.get_peers(3, exclude=exclude) == self.infos[2:5]
+        random_peers = self.peers.get_peers(3, randomize=True, exclude=exclude)
+        assert len(random_peers) == 3
+        assert not set(random_peers) & exclude
+
+    def test_get_peers_recent_threshold(self):
+        self.peers.time_added[self.infos[0]] = uint64(int(time.time()) - 1000)
+        assert self.peers.get_peers(recent_threshold=100) == self.infos[1:]
+        assert self.peers.get_peers(2, recent_threshold=100) == self.infos[1:3]
+        assert self.peers.get_peers(recent_threshold=2000) == self.infos
+
+    def test_remove(self):
+        assert self.peers.remove(self.infos[0])
+        assert not self.peers.remove(self.infos[0])
+        assert self.peers.get_peers(2) == self.infos[1:3]
+
+
+class TestPeerConnections:
+    def test_full_node_connections(self):
+        global_connections = PeerConnections([])
+        full_node = make_connection(NodeType.FULL_NODE, 8445)
+        introducer = make_connection(NodeType.INTRODUCER, 8446)
+        assert global_connections.add(full_node)
+        assert global_connections.add(introducer)
+
+        # The introducer also has a peer info after the handshake, but is not a peer
+        assert introducer.get_peer_info() is not None
+        assert global_connections.get_full_node_connections() == [full_node]
+        assert global_connections.count_full_node_connections() == 1
+        assert global_connections.get_full_node_peerinfos() == [
+            full_node.get_peer_info()
+        ]
+
+    @pytest.mark.asyncio
+    async def test_wait_for_peer_slot_timeout(self):
+        global_connections = PeerConnections([])
+        start = time.time()
+        await global_connections.wait_for_peer_slot(0.2)
+        assert time.time() - start >= 0.2
+
+    @pytest.mark.asyncio
+    async def test_wait_for_peer_slot_wakeup(self):
+        global_connections = PeerConnections([])
+        full_node = make_connection(NodeType.FULL_NODE, 8445)
+        farmer = make_connection(NodeType.FARMER, 8446)
+        introducer = make_connection(NodeType.INTRODUCER, 8447)
+        assert global_connections.add(full_node)
+        assert global_connections.add(farmer)
+        assert global_connections.add(introducer)
+        assert global_connections.count_full_node_connections() == 1
+
+        waiter = asyncio.create_task(global_connections.wait_for_peer_slot(10))
+        await asyncio.sleep(0.1)
+
+        # Only closing a connection that is counted as a peer frees a peer slot
+        global_connections.close(farmer)
+        global_connections.close(introducer)
+        await asyncio.sleep(0.1)
+        assert not waiter.done()
+        assert global_connections.count_full_node_connections() == 1
+
+        global_connections.close(full_node, True)
+        assert await asyncio.wait_for(waiter, 1)
+        assert global_connections.count_full_node_connections() == 0
+
+        # A close only wakes the tasks that were already waiting
+        start = time.time()
+        assert not await global_connections.wait_for_peer_slot(0.2)
+        assert time.time() - start >= 0.2
+
+
+class TestEncodeMessage(unittest.TestCase):
+    def test_framing(self):
+        for message in [
+            Message("ping", {}),
+            Message("respond_block", {"block": bytes(100000), "height": 5}),
+        ]:
+            payload = cbor.dumps({"f": message.function, "d": message.data})
+            expected = len(payload).to_bytes(LENGTH_BYTES, "big") + payload
+            assert encode_message(message) == expected
+
+
+class TestChiaConnectionSend:
+    @pytest.mark.asyncio
+    async def test_send_keeps_order(self, monkeypatch):
+        monkeypatch.setattr(connection_module, "encode_message", slow_encode_message)
+        connection = make_connection(NodeType.FULL_NODE, 8445)
+
+        # The large message is encoded in the executor, but still written first
+        large = asyncio.create_task(
+            connection.send(Message("respond_block", {"block": bytes(1000)}))
+        )
+        small = asyncio.create_task(connection.send(Message("ping", {})))
+        await asyncio.gather(large, small)
+        assert written_functions(connection) == ["respond_block", "ping"]
+
+    @pytest.mark.asyncio
+    async def test_close_after_pending_sends(self, monkeypatch):
+        monkeypatch.setattr(connection_module, "encode_message", slow_encode_message)
+        connection = make_connection(NodeType.FULL_NODE, 8445)
+        written_before_close: List[str] = []
+
+        async def close():
+            await connection.wait_for_pending_sends()
+            written_before_close.extend(written_functions(connection))
+            connection.close()
+
+        # Created in the same order as by the pipeline, for a response and a CLOSE
+        send = asyncio.create_task(
+            connection.send(Message("respond_block", {"block": bytes(1000)}))
+        )
+        await asyncio.gather(send, asyncio.create_task(close()))
+        assert written_before_close == ["respond_block"]
+        assert connection.is_closing()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_send_does_not_cancel_encoding(self, monkeypatch):
+        monkeypatch.setattr(connection_module, "encode_message", slow_encode_message)
+        first = make_connection(NodeType.FULL_NODE, 8445)
+        second = make_connection(NodeType.FULL_NODE, 8446)
+        message = Message("respond_block", {"block": bytes(1000)})
+
+        first_send = asyncio.create_task(first.send(message))
+        second_send = asyncio.create_task(second.send(message))
+        await asyncio.sleep(0.05)
+        first_send.cancel()
+
+        await second_send
+        assert written_functions(second) == ["respond_block"]
+        with pytest.raises(asyncio.CancelledError):
+            await first_send
+
+        await first.send(message)
+        assert written_functions(first) == ["respond_block"]
+
+    @pytest.mark.asyncio
+    async def test_failed_encoding_is_retried(self, monkeypatch):
+        calls: List[str] = []
+
+        def failing_encode_message(message: Message) -> bytes:
+            calls.append(message.function)
+            if len(calls) == 1:
+                raise ValueError("Encoding failed")
+            return encode_message(message)
+
+        monkeypatch.setattr(connection_module, "encode_message", failing_encode_message)
+        connection = make_connection(NodeType.FULL_NODE, 8445)
+        message = Message("respond_block", {"block": bytes(1000)})
+
+        with pytest.raises(ValueError):
+            await connection.send(message)
+        await connection.send(message)
+        assert len(calls) == 2
+        assert written_functions(connection) == ["respond_block"]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import asyncio
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from src.server.outbound_message import NodeType
+from src.server.server import ChiaServer
+from src.types.peer_info import PeerInfo
+from src.util.ints import uint16
+
+
+class ConnectionAttempts:
+    """
+    Replaces asyncio.open_connection, keeping track of how many attempts are in progress.
+    """
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.in_progress = 0
+        self.max_in_progress = 0
+        self.hosts: List[str] = []
+
+    async def open_connection(self, host, port, ssl=None):
+        self.hosts.append(host)
+        self.in_progress += 1
+        self.max_in_progress = max(self.max_in_progress, self.in_progress)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_progress -= 1
+        raise ConnectionRefusedError(f"Could not connect to {host}:{port}")
+
+
+@pytest.fixture
+async def server():
+    # An empty config means no ssl, and introducers do not start a ping task
+    server = ChiaServer(
+        8444, object(), NodeType.INTRODUCER, 10, "testnet", Path("."), {}
+    )
+    yield server
+    server.close_all()
+    await server.await_closed()
+
+
+class TestStartClients:
+    @pytest.mark.asyncio
+    async def test_max_concurrent(self, server, monkeypatch):
+        attempts = ConnectionAttempts(0.05)
+        monkeypatch.setattr(asyncio, "open_connection", attempts.open_connection)
+        peers = [PeerInfo(f"127.0.0.{i}", uint16(8444)) for i in range(1, 7)]
+
+        results = await server.start_clients(peers, max_concurrent=2)
+        assert results == [False] * len(peers)
+        assert sorted(attempts.hosts) == sorted(peer.host for peer in peers)
+        assert attempts.max_in_progress == 2
+        assert server._oc_tasks == []
+
+    @pytest.mark.asyncio
+    async def test_timeout_removes_peer_once(self, server, monkeypatch):
+        attempts = ConnectionAttempts(10)
+        monkeypatch.setattr(asyncio, "open_connection", attempts.open_connection)
+        peer = PeerInfo("127.0.0.1", uint16(8444))
+        peers = server.global_connections.peers
+        assert peers.add(peer)
+
+        removed: List[PeerInfo] = []
+        remove = peers.remove
+
+        def remove_counted(peer_info):
+            removed.append(peer_info)
+            return remove(peer_info)
+
+        monkeypatch.setattr(peers, "remove", remove_counted)
+
+        assert await server.start_clients([peer], timeout=0.1) == [False]
+        assert removed == [peer]
+        assert peers.get_peers() == []
+        assert attempts.in_progress == 0
+        assert server._oc_tasks == []
+
+    @pytest.mark.asyncio
+    async def test_cancel_cleans_up_attempts(self, server, monkeypatch):
+        attempts = ConnectionAttempts(10)
+        monkeypatch.setattr(asyncio, "open_connection", attempts.open_connection)
+        peers = [PeerInfo(f"127.0.0.{i}", uint16(8444)) for i in range(1, 4)]
+
+        task = asyncio.create_task(server.start_clients(peers))
+        await asyncio.sleep(0.05)
+        assert len(server._oc_tasks) == 3
+
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0)
+        assert server._oc_tasks == []
+        assert attempts.in_progress == 0
@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+from src.server.connection import PeerConnections
+from src.server.outbound_message import Delivery, NodeType
+from src.server.start_service import create_periodic_introducer_poll_task
+from src.types.peer_info import PeerInfo
+from src.util.ints import uint16
+from tests.server.test_connection import make_connection
+
+
+class FakeServer:
+    def __init__(self, global_connections: PeerConnections):
+        self.global_connections = global_connections
+        self.pushed_messages = []
+        self.started_clients = []
+
+    def push_message(self, message):
+        self.pushed_messages.append(message)
+
+    async def start_client(self, target_node, on_connect=None, auth=False):
+        self.started_clients.append(target_node)
+        return False
+
+
+async def stop(task: asyncio.Task):
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+
+class TestIntroducerPoll:
+    @pytest.mark.asyncio
+    async def test_reuses_introducer_connection(self):
+        introducer = make_connection(NodeType.INTRODUCER, 8445)
+        global_connections = PeerConnections([])
+        assert global_connections.add(introducer)
+        server = FakeServer(global_connections)
+        introducer_peer = PeerInfo("127.0.0.1", uint16(8445))
+
+        task = create_periodic_introducer_poll_task(
+            server, introducer_peer, global_connections, 0.5, 2
+        )
+        await asyncio.sleep(0.1)
+
+        # The peer request goes over the open connection, without a new handshake
+        assert len(server.pushed_messages) == 1
+        outbound = server.pushed_messages[0]
+        assert outbound.peer_type == NodeType.INTRODUCER
+        assert outbound.message.function == "request_peers"
+        assert outbound.delivery_method == Delivery.BROADCAST
+        assert server.started_clients == []
+        assert introducer in global_connections.get_connections()
+
+        # Once idle, the introducer connection is closed, and the next poll connects
+        await asyncio.sleep(0.7)
+        assert introducer not in global_connections.get_connections()
+        assert server.started_clients == [introducer_peer]
+        await stop(task)
+
+    @pytest.mark.asyncio
+    async def test_introducer_not_counted_as_peer(self):
+        full_node = make_connection(NodeType.FULL_NODE, 8444)
+        introducer = make_connection(NodeType.INTRODUCER, 8445)
+        global_connections = PeerConnections([])
+        assert global_connections.add(full_node)
+        assert global_connections.add(introducer)
+        assert global_connections.count_full_node_connections() == 1
+        server = FakeServer(global_connections)
+
+        # One more peer is needed, so the introducer is asked instead of being closed
+        task = create_periodic_introducer_poll_task(
+            server, PeerInfo("127.0.0.1", uint16(8445)), global_connections, 10, 2
+        )
+        await asyncio.sleep(0.1)
+        assert len(server.pushed_messages) == 1
+        assert introducer in global_connections.get_connections()
+        await stop(task)
+
+        # With enough peers the introducer connection is closed without a request
+        server = FakeServer(global_connections)
+        task = create_periodic_introducer_poll_task(
+            server, PeerInfo("127.0.0.1", uint16(8445)), global_connections, 10, 1
+        )
+        await asyncio.sleep(0.1)
+        assert server.pushed_messages == []
+        assert server.started_clients == []
+        assert global_connections.get_connections() == [full_node]
+        await stop(task)
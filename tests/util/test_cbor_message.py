@@ -0,0 +1,62 @@
+import copy
+import dataclasses
+import pickle
+import unittest
+
+from src.types.sized_bytes import bytes32
+from src.util import cbor
+from src.util.cbor_message import cbor_message
+from src.util.ints import uint32
+
+
+@dataclasses.dataclass(frozen=True)
+@cbor_message
+class HashMessage:
+    height: uint32
+    header_hash: bytes32
+
+
+@dataclasses.dataclass(frozen=True)
+@cbor_message
+class HeightMessage:
+    height: uint32
+    weight: uint32
+
+
+class TestCborMessage(unittest.TestCase):
+    def setUp(self):
+        self.message = HashMessage(uint32(5), bytes32(bytes([1] * 32)))
+
+    def test_no_instance_dict(self):
+        assert not hasattr(self.message, "__dict__")
+        assert HashMessage.__cbor_fields__ == ("height", "header_hash")
+
+    def test_eq_and_hash(self):
+        other = HashMessage(uint32(5), bytes32(bytes([1] * 32)))
+        assert self.message == other
+        assert hash(self.message) == hash(other)
+        assert self.message != HashMessage(uint32(6), bytes32(bytes([1] * 32)))
+
+    def test_replace_and_copy(self):
+        replaced = dataclasses.replace(self.message, height=uint32(6))
+        assert type(replaced) is HashMessage
+        assert replaced.height == 6
+        assert replaced.header_hash == self.message.header_hash
+        assert copy.copy(self.message) == self.message
+        assert copy.deepcopy(self.message) == self.message
+
+    def test_pickle(self):
+        # bytes32 itself cannot be pickled, so only int fields are used here
+        message = HeightMessage(uint32(5), uint32(10))
+        unpickled = pickle.loads(pickle.dumps(message))
+        assert type(unpickled) is HeightMessage
+        assert unpickled == message
+
+    def test_cbor_round_trip(self):
+        data = cbor.loads(cbor.dumps(self.message))
+        assert data == {"height": 5, "header_hash": bytes([1] * 32)}
+        assert HashMessage(**data) == self.message
+
+
+if __name__ == "__main__":
+    unittest.main()
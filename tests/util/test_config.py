@@ -0,0 +1,33 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.util.config import create_default_chia_config, load_config, save_config
+
+
+class TestConfig(unittest.TestCase):
+    def test_load_returns_independent_copies(self):
+        with tempfile.TemporaryDirectory() as root:
+            root_path = Path(root)
+            create_default_chia_config(root_path)
+
+            config = load_config(root_path, "config.yaml")
+            config["full_node"]["port"] = 1
+            assert load_config(root_path, "config.yaml")["full_node"]["port"] != 1
+
+            full_node_config = load_config(root_path, "config.yaml", "full_node")
+            assert full_node_config == load_config(root_path, "config.yaml")["full_node"]
+
+    def test_save_invalidates_cache(self):
+        with tempfile.TemporaryDirectory() as root:
+            root_path = Path(root)
+            create_default_chia_config(root_path)
+
+            config = load_config(root_path, "config.yaml")
+            config["full_node"]["port"] = 1
+            save_config(root_path, "config.yaml", config)
+            assert load_config(root_path, "config.yaml")["full_node"]["port"] == 1
+
+
+if __name__ == "__main__":
+    unittest.main()
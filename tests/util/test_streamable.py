@@ -87,6 +87,37 @@ class TestStreamable(unittest.TestCase):
         c = cbor.loads(cbor.dumps(rr))
         RespondRemovals(c["height"], c["header_hash"], c["coins"], c["proofs"])
 
+    def test_parse_streamable_bytes(self):
+        @dataclass(frozen=True)
+        @streamable
+        class TestClass1(Streamable):
+            a: bytes
+
+        @dataclass(frozen=True)
+        @streamable
+        class TestClass2(Streamable):
+            a: uint32
+            b: bytes32
+
+        @dataclass(frozen=True)
+        @streamable
+        class TestClass3(Streamable):
+            a: TestClass1
+            b: List[TestClass2]
+
+        tc1 = TestClass1(b"abc")
+        tc2_list = [TestClass2(uint32(i), bytes32([i] * 32)) for i in range(3)]
+
+        # Streamable fields are received over the wire as their serialization
+        tc3 = TestClass3(bytes(tc1), [bytes(tc2) for tc2 in tc2_list])  # type: ignore
+        assert tc3 == TestClass3(tc1, tc2_list)
+        assert tc3.a.a == b"abc"
+        assert tc3 == TestClass3.from_bytes(bytes(tc3))
+
+        # A truncated blob does not parse
+        with self.assertRaises(AssertionError):
+            TestClass3(tc1, [bytes(uint32(1)) + b"\x01"])  # type: ignore
+
 
 if __name__ == "__main__":
     unittest.main()